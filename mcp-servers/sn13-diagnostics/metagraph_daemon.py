@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+SN13 Metagraph Daemon
+=====================
+
+Keeps bittensor imported and the SN13 metagraph warm so the diagnostics
+MCP server can look up a hotkey without starting a new interpreter.
+Run it with the data-universe venv, e.g.:
+
+    pm2 start metagraph_daemon.py --name sn13-meta \\
+        --interpreter /home/afu/bittensor/data-universe/venv/bin/python
+
+Protocol: one JSON request per line over a unix socket,
+{"op": "query", "hotkey": "..."}, answered with one JSON line.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import bittensor as bt
+
+SOCKET_PATH = os.environ.get("SN13_META_SOCKET", "/tmp/sn13_meta.sock")
+NETUID = 13
+REFRESH_INTERVAL = 60  # seconds
+
+# Chain connection, latest metagraph and a hotkey -> uid index over it
+_state = {"subtensor": None, "metagraph": None, "uids": {}, "ts": 0.0}
+
+
+def refresh_metagraph():
+    """Sync the metagraph over the shared connection and rebuild the hotkey index."""
+    m = _state["subtensor"].metagraph(NETUID)
+    _state.update(
+        metagraph=m,
+        uids={hotkey: uid for uid, hotkey in enumerate(m.hotkeys)},
+        ts=time.time()
+    )
+
+
+def lookup(hotkey: str) -> dict:
+    """Get the metagraph position of a hotkey."""
+    m = _state["metagraph"]
+    if m is None:
+        return {"error": "metagraph not loaded"}
+    u = _state["uids"].get(hotkey)
+    if u is None:
+        return {"error": "not_found"}
+    return {
+        "uid": u,
+        "incentive": float(m.incentive[u]),
+        "trust": float(m.trust[u]),
+        "rank": float(m.ranks[u])
+    }
+
+
+async def refresh_forever():
+    """Refresh the metagraph every REFRESH_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(REFRESH_INTERVAL)
+        try:
+            await asyncio.to_thread(refresh_metagraph)
+        except Exception as e:
+            # Keep serving the last good metagraph
+            print(f"Metagraph refresh failed: {e}", flush=True)
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Answer JSON line requests until the client disconnects."""
+    try:
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+                if request.get("op") == "query":
+                    response = lookup(str(request.get("hotkey", "")))
+                else:
+                    response = {"error": f"unknown op: {request.get('op')}"}
+            except (ValueError, AttributeError):
+                response = {"error": "invalid request"}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def main():
+    """Connect to finney once, load the metagraph, then serve lookups on SOCKET_PATH."""
+    _state["subtensor"] = await asyncio.to_thread(bt.subtensor, "finney")
+    try:
+        await asyncio.to_thread(refresh_metagraph)
+
+        if os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)
+        server = await asyncio.start_unix_server(handle_client, path=SOCKET_PATH)
+        os.chmod(SOCKET_PATH, 0o600)
+        print(f"Serving SN13 metagraph on {SOCKET_PATH}", flush=True)
+
+        async with server:
+            await asyncio.gather(server.serve_forever(), refresh_forever())
+    finally:
+        _state["subtensor"].close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
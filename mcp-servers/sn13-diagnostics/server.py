@@ -12,6 +12,12 @@ import json
 import re
 import subprocess
 import os
+import signal
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter, deque
 from pathlib import Path
 from datetime import datetime
 
@@ -19,6 +25,31 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+try:
+    import re2  # google-re2: linear-time multi-pattern matching via RE2::Set
+except ImportError:
+    re2 = None
+# Other modules install as "re2" too (e.g. pyre2) without the RE2::Set API
+if re2 is not None and not (
+    hasattr(re2, "Options") and hasattr(getattr(re2, "Set", None), "SearchSet")
+):
+    re2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick  # pyahocorasick: literal pre-filter for stdlib patterns
+except ImportError:
+    ahocorasick = None
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
 # Config from environment or defaults
 DATA_UNIVERSE_PATH = Path(os.environ.get(
     "DATA_UNIVERSE_PATH",
@@ -26,30 +57,561 @@ DATA_UNIVERSE_PATH = Path(os.environ.get(
 ))
 ERROR_CATALOG_PATH = DATA_UNIVERSE_PATH / "scripts" / "error_catalog.json"
 HOTKEY = "5Hg6xKtasfFdqx2XQV7dPuVBJFJXp9yEr58rMHSJ7zb5EDD3"
+PM2_LOG_DIR = Path(os.environ.get("PM2_HOME", Path.home() / ".pm2")) / "logs"
+LOGS_CACHE_TTL = 5  # seconds
+METAGRAPH_CACHE_PATH = Path(os.environ.get(
+    "SN13_META_CACHE",
+    Path.home() / ".cache" / "sn13_meta_cache.json"
+))
+METAGRAPH_CACHE_TTL = 60  # seconds
+METAGRAPH_SOCKET_PATH = os.environ.get("SN13_META_SOCKET", "/tmp/sn13_meta.sock")
 
 server = Server("sn13-diagnostics")
 
+# Compiled catalog, rebuilt only when error_catalog.json changes on disk.
+# Rebuilds rebind a new dict so callers holding the old one stay consistent.
+_CATALOG_CACHE = {}
+
+# Largest recent pm2 log dump; smaller requests are served by tailing it
+_LOGS_CACHE = {"mtimes": None, "ts": 0.0, "lines": 0, "text": b""}
+_LOGS_LOCK = asyncio.Lock()
+
+# Header pm2 prints before each log file's tail in `pm2 logs --nostream`
+_PM2_LOG_HEADER_RE = re.compile(rb"\S+ last \d+ lines:\s*$")
+
+# Run in the data-universe venv; the hotkey is passed as argv[1] so the
+# script text never changes and nothing is interpolated into code
+_META_SCRIPT = """
+import sys
+import json
+import bittensor as bt
+hotkey = sys.argv[1]
+m = bt.subtensor('finney').metagraph(13)
+for u in range(len(m.hotkeys)):
+    if m.hotkeys[u] == hotkey:
+        print(json.dumps({'uid': u, 'incentive': float(m.incentive[u]), 'trust': float(m.trust[u]), 'rank': float(m.ranks[u])}), flush=True)
+        break
+else:
+    print(json.dumps({'error': 'not_found'}), flush=True)
+"""
+
+# Last metagraph lookup for HOTKEY; ts is time.monotonic()
+_META_CACHE = {"ts": 0.0, "data": None}
+
+# Read-only connection to the miner database, shared across tool calls
+_DB_CONN = None
+_DB_LOCK = asyncio.Lock()
+
+# X account log checks, compiled once with the account number captured so
+# each runs in a single pass and is bucketed per account.
+_ACCOUNT_SCHEDULED_RE = re.compile(rb"X\.twikit_account(\d+)")
+# Rate limits and errors match once per log line; bounded gaps instead of
+# .* keep backtracking linear in the line length.
+_ACCOUNT_RATE_LIMIT_RE = re.compile(
+    rb"^(?:[^\n]*twikit_account(\d+)[^\n]{0,200}?429"
+    rb"|[^\n]*?Pagination[^\n]{0,200}?429[^\n]{0,200}?twikit_account(\d+))",
+    re.MULTILINE | re.IGNORECASE
+)
+_ACCOUNT_ERROR_RE = re.compile(
+    rb"^[^\n]*twikit_account(\d+)[^\n]{0,200}?(?:403|401|expired|suspended)",
+    re.MULTILINE | re.IGNORECASE
+)
+
 
 def load_error_catalog() -> dict:
-    """Load error catalog from JSON."""
-    if ERROR_CATALOG_PATH.exists():
+    """Load error catalog from JSON.
+
+    Only called when the file's mtime changes; see get_compiled_catalog().
+    """
+    try:
+        if orjson is not None:
+            with open(ERROR_CATALOG_PATH, "rb") as f:
+                return orjson.loads(f.read())
         with open(ERROR_CATALOG_PATH) as f:
             return json.load(f)
-    return {"version": "0", "errors": []}
+    except FileNotFoundError:
+        return {"version": "0", "errors": []}
+
+
+def required_literal(pattern: bytes) -> bytes:
+    """Get the longest literal run every match of pattern must contain.
+
+    Only plain sequences and groups are followed; anything optional,
+    repeated or alternated ends the run. Returned lower-cased, or empty if
+    the pattern has no usable literal.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return b""
+
+    best = b""
+    run = bytearray()
+
+    def walk(items):
+        nonlocal best
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                run.append(av)
+            elif op is sre_parse.SUBPATTERN:
+                walk(av[-1])
+            else:
+                if len(run) > len(best):
+                    best = bytes(run)
+                run.clear()
+
+    walk(parsed)
+    if len(run) > len(best):
+        best = bytes(run)
+    return best.lower()
+
+
+def has_backreference(pattern: bytes) -> bool:
+    """Check whether pattern refers back to one of its own groups.
+
+    Covers ``\\N``, ``(?P=name)`` and ``(?(N)yes|no)``. Such patterns cannot
+    go into the alternation: wrapping them in a named group shifts the group
+    numbers their references point at.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return False
+
+    def walk(node):
+        if isinstance(node, sre_parse.SubPattern):
+            return any(
+                op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS) or walk(av)
+                for op, av in node
+            )
+        if isinstance(node, (tuple, list)):
+            return any(walk(item) for item in node)
+        return False
+
+    return walk(parsed)
+
+
+def get_compiled_catalog() -> dict:
+    """Get the error catalog with its patterns compiled for scanning.
+
+    When google-re2 is installed, all patterns go into one RE2 Set that
+    reports every matching entry in a single linear-time pass. Patterns RE2
+    rejects (backreferences, lookarounds) and, without re2, all patterns are
+    compiled individually for the stdlib scan. Those without backreferences
+    that still compile when wrapped in a named group ``e<index>`` are also
+    joined into one alternation; the rest (backreferences, leading global
+    flags) are only searched on their own, as is everything if the alternation
+    fails to compile (e.g. two patterns sharing a group name). With
+    pyahocorasick, stdlib patterns that contain a literal of 3+ bytes are
+    indexed in an Aho-Corasick automaton so only candidates are searched.
+    Patterns neither engine accepts are left out.
+
+    Also builds the ``lookup_error`` index: per entry, its upper-cased ID and
+    a lower-cased blob of all its field values.
+    """
+    try:
+        mtime = ERROR_CATALOG_PATH.stat().st_mtime
+    except OSError:
+        mtime = None
+
+    global _CATALOG_CACHE
+    if _CATALOG_CACHE.get("mtime") != mtime or "catalog" not in _CATALOG_CACHE:
+        catalog = load_error_catalog()
+        entries = {}
+        groups = {}
+        patterns = {}
+        re2_set = None
+        re2_groups = []
+        if re2 is not None:
+            options = re2.Options()
+            options.case_sensitive = False
+            options.log_errors = False
+            re2_set = re2.Set.SearchSet(options)
+
+        for i, err in enumerate(catalog.get("errors", [])):
+            pattern = err.get("pattern", "")
+            if not pattern:
+                continue
+            if re2_set is not None:
+                try:
+                    re2_set.Add(pattern.encode())
+                    entries[f"e{i}"] = err
+                    re2_groups.append(f"e{i}")
+                    continue
+                except re2.error:
+                    pass
+            try:
+                compiled_pattern = re.compile(pattern.encode(), re.IGNORECASE)
+            except re.error:
+                continue
+            entries[f"e{i}"] = err
+            patterns[f"e{i}"] = compiled_pattern
+            if compiled_pattern.groups and has_backreference(compiled_pattern.pattern):
+                continue
+            group = f"(?P<e{i}>{pattern})".encode()
+            try:
+                re.compile(group, re.IGNORECASE)
+                groups[f"e{i}"] = group
+            except re.error:
+                pass
+
+        union = None
+        if groups:
+            try:
+                union = re.compile(b"|".join(groups.values()), re.IGNORECASE)
+            except re.error:
+                pass
 
+        if re2_groups:
+            re2_set.Compile()
+        else:
+            re2_set = None
+
+        automaton = None
+        unfiltered = []
+        if ahocorasick is not None and patterns:
+            by_literal = {}
+            for name, compiled_pattern in patterns.items():
+                literal = required_literal(compiled_pattern.pattern)
+                if len(literal) >= 3:
+                    by_literal.setdefault(literal, []).append(name)
+                else:
+                    unfiltered.append(name)
+            if by_literal:
+                automaton = ahocorasick.Automaton()
+                for literal, names in by_literal.items():
+                    # The automaton is str-keyed; latin-1 maps bytes 1:1
+                    automaton.add_word(literal.decode("latin-1"), tuple(names))
+                automaton.make_automaton()
+
+        index = [
+            (
+                str(err.get("id", "")).upper(),
+                " ".join(str(v) for v in err.values()).lower(),
+                err
+            )
+            for err in catalog.get("errors", [])
+        ]
+
+        _CATALOG_CACHE = {
+            "mtime": mtime,
+            "catalog": catalog,
+            "entries": entries,
+            "groups": groups,
+            "union": union,
+            "patterns": patterns,
+            "automaton": automaton,
+            "unfiltered": unfiltered,
+            "re2_set": re2_set,
+            "re2_groups": re2_groups,
+            "index": index,
+        }
+
+    return _CATALOG_CACHE
+
+
+def scan_catalog(compiled: dict, logs: bytes) -> set:
+    """Return the names of catalog groups whose pattern matches the logs.
+
+    Entries in the RE2 Set are resolved by one ``Match`` call. For the rest,
+    with an Aho-Corasick automaton, one pass over the lower-cased logs picks
+    the candidate entries and only those are searched. Otherwise the
+    alternation makes one pass; it only reports one branch per match
+    position, so an entry can be shadowed by an earlier one matching at the
+    same spot. If that pass finds anything, the entries it did not report
+    are searched individually; a clean log costs one pass. Entries outside
+    the alternation are always searched individually.
+    """
+    found = set()
+    if compiled["re2_set"] is not None:
+        for index in compiled["re2_set"].Match(logs) or ():
+            found.add(compiled["re2_groups"][index])
+
+    if compiled["automaton"] is not None:
+        candidates = set(compiled["unfiltered"])
+        for _, names in compiled["automaton"].iter(logs.lower().decode("latin-1")):
+            candidates.update(names)
+        for name in candidates:
+            if compiled["patterns"][name].search(logs):
+                found.add(name)
+        return found
+
+    pending = set(compiled["patterns"])
+    if compiled["union"] is not None:
+        hits = {m.lastgroup for m in compiled["union"].finditer(logs)}
+        found |= hits
+        # Nothing can be shadowed when no alternative matched at all
+        pending -= hits if hits else compiled["groups"].keys()
+    for name in pending:
+        if compiled["patterns"][name].search(logs):
+            found.add(name)
+    return found
+
+
+def dump_json(obj) -> str:
+    """Serialize a tool result compactly, with orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # orjson rejects e.g. integers wider than 64 bits
+            pass
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def start_kill_timer(proc: subprocess.Popen, timeout: float) -> threading.Timer:
+    """Kill proc's process group if it is still running after timeout seconds.
+
+    proc must be started with ``start_new_session=True``. Killing the group
+    makes sure no child keeps the output pipe open.
+    """
+    timer = threading.Timer(timeout, os.killpg, (proc.pid, signal.SIGKILL))
+    timer.start()
+    return timer
+
+
+async def run_command(cmd: list, timeout: float) -> subprocess.CompletedProcess:
+    """Run cmd without blocking the event loop, killing it on timeout."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout) from None
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout.decode(), stderr.decode())
+
+
+def read_pm2_logs(lines: int) -> bytes:
+    """Read the last `lines` lines of the miner's pm2 logs.
+
+    Output is streamed into a bounded buffer with stderr merged into stdout
+    and kept as bytes; nothing downstream needs it decoded.
+    """
+    proc = subprocess.Popen(
+        ["pm2", "logs", "sn13-miner", "--lines", str(lines), "--nostream"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1 << 20,
+        start_new_session=True
+    )
+    timer = start_kill_timer(proc, 30)
+    try:
+        # pm2 prints the last `lines` of both the out and error log plus headers
+        buf = deque(proc.stdout, maxlen=2 * lines + 8)
+        proc.wait()
+        if not timer.is_alive():
+            raise subprocess.TimeoutExpired(proc.args, 30)
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+    return b"".join(buf)
+
+
+def tail_pm2_logs(text: bytes, lines: int) -> bytes:
+    """Trim a pm2 log dump to the last `lines` lines of each log file."""
+    out = []
+    section = deque(maxlen=lines)
+    for line in text.splitlines(keepends=True):
+        if _PM2_LOG_HEADER_RE.match(line):
+            out.extend(section)
+            section.clear()
+            out.append(line)
+        elif line.strip():
+            section.append(line)
+    out.extend(section)
+    return b"".join(out)
+
+
+async def get_recent_logs(lines: int = 500) -> bytes:
+    """Get recent miner logs from pm2.
+
+    The last dump is shared across tools for ``LOGS_CACHE_TTL`` seconds as
+    long as the pm2 log files have not been written to; a request for fewer
+    lines than were cached is served by tailing it.
+    """
+    mtimes = []
+    for log_name in ("sn13-miner-out.log", "sn13-miner-error.log"):
+        try:
+            mtimes.append((PM2_LOG_DIR / log_name).stat().st_mtime)
+        except OSError:
+            mtimes.append(None)
+
+    async with _LOGS_LOCK:
+        now = time.monotonic()
+        if (
+            _LOGS_CACHE["mtimes"] == mtimes
+            and now - _LOGS_CACHE["ts"] < LOGS_CACHE_TTL
+            and _LOGS_CACHE["lines"] >= lines
+        ):
+            if _LOGS_CACHE["lines"] == lines:
+                return _LOGS_CACHE["text"]
+            return tail_pm2_logs(_LOGS_CACHE["text"], lines)
+
+        try:
+            text = await asyncio.to_thread(read_pm2_logs, lines)
+        except Exception as e:
+            return f"Error getting logs: {e}".encode()
+        _LOGS_CACHE.update(mtimes=mtimes, ts=now, lines=lines, text=text)
+        return text
+
+
+async def query_metagraph() -> tuple[dict, bool]:
+    """Look up HOTKEY on the SN13 metagraph in the data-universe venv.
+
+    Returns the result and whether it came from the metagraph itself. Output
+    is read line by line and the child is killed as soon as its JSON line
+    arrives, so a slow bittensor shutdown never holds up the caller.
+    """
+    cmd = [str(DATA_UNIVERSE_PATH / "venv" / "bin" / "python"), "-c", _META_SCRIPT, HOTKEY]
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True,
+        limit=1 << 20
+    )
+
+    async def read_result() -> tuple[dict, bool]:
+        output = deque(maxlen=20)
+        async for raw_line in proc.stdout:
+            line = raw_line.decode(errors="replace")
+            if line.startswith("{"):
+                try:
+                    return json.loads(line), True
+                except json.JSONDecodeError:
+                    pass
+            output.append(line)
+        await proc.wait()
+        return {"error": "".join(output)}, False
 
-def get_recent_logs(lines: int = 500) -> str:
-    """Get recent miner logs from pm2."""
     try:
-        result = subprocess.run(
-            ["pm2", "logs", "sn13-miner", "--lines", str(lines), "--nostream"],
-            capture_output=True,
-            text=True,
-            timeout=30
+        return await asyncio.wait_for(read_result(), 60)
+    except asyncio.TimeoutError:
+        raise subprocess.TimeoutExpired(cmd, 60) from None
+    finally:
+        if proc.returncode is None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+
+async def query_metagraph_daemon() -> tuple[dict, bool]:
+    """Look up HOTKEY through metagraph_daemon.py, if it is running.
+
+    Returns the result and whether it is authoritative; anything other than
+    a position or ``not_found`` (daemon down, still loading) is not.
+    """
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(METAGRAPH_SOCKET_PATH), 2
         )
-        return result.stdout + result.stderr
-    except Exception as e:
-        return f"Error getting logs: {e}"
+    except (OSError, asyncio.TimeoutError) as e:
+        return {"error": str(e)}, False
+
+    try:
+        writer.write(json.dumps({"op": "query", "hotkey": HOTKEY}).encode() + b"\n")
+        await writer.drain()
+        data = json.loads(await asyncio.wait_for(reader.readline(), 5))
+    except (OSError, ValueError, asyncio.TimeoutError) as e:
+        return {"error": str(e)}, False
+    finally:
+        writer.close()
+
+    ok = isinstance(data, dict) and data.get("error", "not_found") == "not_found"
+    return data, ok
+
+
+async def get_metagraph_info() -> dict:
+    """Get our metagraph position, cached for METAGRAPH_CACHE_TTL seconds.
+
+    Asks the warm metagraph daemon first. Without it, the lookup falls back
+    to a bittensor subprocess whose result is also persisted to
+    METAGRAPH_CACHE_PATH, so a restarted server does not pay for another
+    bittensor import straight away.
+    """
+    now = time.monotonic()
+    if _META_CACHE["data"] is not None and now - _META_CACHE["ts"] < METAGRAPH_CACHE_TTL:
+        return _META_CACHE["data"]
+
+    data, ok = await query_metagraph_daemon()
+    if ok:
+        _META_CACHE.update(ts=now, data=data)
+        return data
+
+    try:
+        with open(METAGRAPH_CACHE_PATH) as f:
+            cached = json.load(f)
+        age = time.time() - cached["ts"]
+        if cached["hotkey"] == HOTKEY and 0 <= age < METAGRAPH_CACHE_TTL:
+            _META_CACHE.update(ts=now - age, data=cached["data"])
+            return cached["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    data, ok = await query_metagraph()
+    if ok:
+        _META_CACHE.update(ts=now, data=data)
+        tmp_path = None
+        try:
+            METAGRAPH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            # mkstemp creates a fresh 0600 file, never following a planted link
+            fd, tmp_path = tempfile.mkstemp(dir=METAGRAPH_CACHE_PATH.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"hotkey": HOTKEY, "ts": time.time(), "data": data}, f)
+            os.replace(tmp_path, METAGRAPH_CACHE_PATH)
+        except OSError:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    return data
+
+
+async def get_pm2_status() -> dict:
+    """Get the sn13-miner entry from ``pm2 jlist``."""
+    result = await run_command(["pm2", "jlist"], timeout=10)
+    processes = json.loads(result.stdout)
+    for proc in processes:
+        if proc.get("name") == "sn13-miner":
+            return {
+                "found": True,
+                "status": proc.get("pm2_env", {}).get("status"),
+                "uptime_ms": proc.get("pm2_env", {}).get("pm_uptime"),
+                "restarts": proc.get("pm2_env", {}).get("restart_time", 0),
+                "memory_mb": round(proc.get("monit", {}).get("memory", 0) / 1024 / 1024, 1),
+                "cpu": proc.get("monit", {}).get("cpu")
+            }
+    return {"found": False}
+
+
+def count_data_entities(db_path: Path) -> dict:
+    """Count DataEntity rows per source over a cached read-only connection.
+
+    Runs in worker threads; callers serialize access with _DB_LOCK.
+    """
+    global _DB_CONN
+    try:
+        if _DB_CONN is None:
+            _DB_CONN = sqlite3.connect(
+                f"{db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+            )
+            _DB_CONN.execute("PRAGMA mmap_size=268435456")
+            _DB_CONN.execute("PRAGMA query_only=1")
+        rows = _DB_CONN.execute(
+            "SELECT source, COUNT(*) FROM DataEntity GROUP BY source"
+        ).fetchall()
+    except sqlite3.Error:
+        # Drop the connection so the next call reconnects
+        if _DB_CONN is not None:
+            _DB_CONN.close()
+            _DB_CONN = None
+        raise
+    return dict(rows)
 
 
 @server.list_tools()
@@ -141,24 +703,22 @@ async def call_tool(name: str, arguments: dict):
 
     if name == "scan_logs":
         lines = arguments.get("lines", 500)
-        catalog = load_error_catalog()
-        logs = get_recent_logs(lines)
+        compiled = get_compiled_catalog()
+        catalog = compiled["catalog"]
+        logs = await get_recent_logs(lines)
+
+        found_groups = scan_catalog(compiled, logs)
 
         found = []
-        for err in catalog.get("errors", []):
-            pattern = err.get("pattern", "")
-            if pattern:
-                try:
-                    if re.search(pattern, logs, re.IGNORECASE):
-                        found.append({
-                            "id": err.get("id"),
-                            "category": err.get("category"),
-                            "severity": err.get("severity"),
-                            "root_cause": err.get("root_cause"),
-                            "fix": err.get("fix")
-                        })
-                except re.error:
-                    pass
+        for group, err in compiled["entries"].items():
+            if group in found_groups:
+                found.append({
+                    "id": err.get("id"),
+                    "category": err.get("category"),
+                    "severity": err.get("severity"),
+                    "root_cause": err.get("root_cause"),
+                    "fix": err.get("fix")
+                })
 
         result = {
             "timestamp": datetime.utcnow().isoformat(),
@@ -171,55 +731,17 @@ async def call_tool(name: str, arguments: dict):
                 else "warning"
             )
         }
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=dump_json(result))]
 
     elif name == "get_miner_status":
-        # Check pm2 status
-        try:
-            pm2_result = subprocess.run(
-                ["pm2", "jlist"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            processes = json.loads(pm2_result.stdout)
-            pm2_status = {"found": False}
-            for proc in processes:
-                if proc.get("name") == "sn13-miner":
-                    pm2_status = {
-                        "found": True,
-                        "status": proc.get("pm2_env", {}).get("status"),
-                        "uptime_ms": proc.get("pm2_env", {}).get("pm_uptime"),
-                        "restarts": proc.get("pm2_env", {}).get("restart_time", 0),
-                        "memory_mb": round(proc.get("monit", {}).get("memory", 0) / 1024 / 1024, 1),
-                        "cpu": proc.get("monit", {}).get("cpu")
-                    }
-                    break
-        except Exception as e:
-            pm2_status = {"error": str(e)}
-
-        # Check metagraph (async-safe via subprocess)
-        try:
-            script = f"""
-import bittensor as bt
-import json
-m = bt.subtensor('finney').metagraph(13)
-for u in range(len(m.hotkeys)):
-    if m.hotkeys[u] == '{HOTKEY}':
-        print(json.dumps({{'uid': u, 'incentive': float(m.incentive[u]), 'trust': float(m.trust[u]), 'rank': float(m.ranks[u])}}))
-        break
-else:
-    print(json.dumps({{'error': 'not_found'}}))
-"""
-            meta_result = subprocess.run(
-                [str(DATA_UNIVERSE_PATH / "venv" / "bin" / "python"), "-c", script],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            metagraph = json.loads(meta_result.stdout.strip()) if meta_result.stdout.strip() else {"error": meta_result.stderr}
-        except Exception as e:
-            metagraph = {"error": str(e)}
+        # Check pm2 status and metagraph (cached) concurrently
+        pm2_status, metagraph = await asyncio.gather(
+            get_pm2_status(), get_metagraph_info(), return_exceptions=True
+        )
+        if isinstance(pm2_status, Exception):
+            pm2_status = {"error": str(pm2_status)}
+        if isinstance(metagraph, Exception):
+            metagraph = {"error": str(metagraph)}
 
         result = {
             "timestamp": datetime.utcnow().isoformat(),
@@ -227,66 +749,80 @@ else:
             "metagraph": metagraph,
             "overall": "healthy" if pm2_status.get("status") == "online" else "critical"
         }
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=dump_json(result))]
 
     elif name == "lookup_error":
         query = arguments.get("query", "").upper()
-        catalog = load_error_catalog()
+        query_lower = query.lower()
 
-        matches = []
-        for err in catalog.get("errors", []):
-            # Match by ID
-            if err.get("id", "").upper() == query:
-                matches.append(err)
-            # Match by text in any field
-            elif query.lower() in json.dumps(err).lower():
-                matches.append(err)
+        # Match by ID or by text in any field
+        matches = [
+            err for err_id, blob, err in get_compiled_catalog()["index"]
+            if err_id == query or query_lower in blob
+        ]
 
         result = {
             "query": query,
             "matches": matches,
             "count": len(matches)
         }
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=dump_json(result))]
 
     elif name == "check_x_accounts":
         accounts = arguments.get("accounts", list(range(1, 18)))
         results = []
 
         # Get recent logs to check actual scraping activity per account
-        logs = get_recent_logs(3000)
+        logs_b = await get_recent_logs(3000)
+
+        # Bucket scheduling mentions, rate limits and auth errors per account
+        # in one pass each
+        mentions = Counter(int(m.group(1)) for m in _ACCOUNT_SCHEDULED_RE.finditer(logs_b))
+        rate_limits = Counter(
+            int(m.group(1) or m.group(2)) for m in _ACCOUNT_RATE_LIMIT_RE.finditer(logs_b)
+        )
+        auth_errors = Counter(int(m.group(1)) for m in _ACCOUNT_ERROR_RE.finditer(logs_b))
+
+        # List all cookie files with one directory read
+        try:
+            with os.scandir(DATA_UNIVERSE_PATH) as it:
+                cookie_entries = {
+                    e.name: e for e in it
+                    if e.name.startswith("twitter_cookies") and e.name.endswith(".json")
+                }
+        except OSError:
+            cookie_entries = {}
+        now_ts = time.time()
+        now_iso = datetime.utcfromtimestamp(now_ts).isoformat()
 
         for acc_num in accounts:
             suffix = "" if acc_num == 1 else f"_account{acc_num}"
-            cookie_file = DATA_UNIVERSE_PATH / f"twitter_cookies{suffix}.json"
+            cookie_entry = cookie_entries.get(f"twitter_cookies{suffix}.json")
 
             acct_info = {"account": acc_num}
 
-            # 1. Cookie file check
-            if not cookie_file.exists():
+            # 1. Cookie file check (a dangling symlink counts as missing)
+            try:
+                mtime = cookie_entry.stat().st_mtime if cookie_entry else None
+            except OSError:
+                mtime = None
+            if mtime is None:
                 acct_info.update({"status": "missing", "cookie_file": False})
                 results.append(acct_info)
                 continue
 
             # Cookie file age
-            try:
-                mtime = os.path.getmtime(cookie_file)
-                age_hours = (datetime.utcnow() - datetime.utcfromtimestamp(mtime)).total_seconds() / 3600
-                acct_info["cookie_file"] = True
-                acct_info["cookie_age_hours"] = round(age_hours, 1)
-            except Exception:
-                acct_info["cookie_file"] = True
-                acct_info["cookie_age_hours"] = None
+            acct_info["cookie_file"] = True
+            acct_info["cookie_age_hours"] = round((now_ts - mtime) / 3600.0, 1)
 
             # 2. Log-based activity check
             # Logs use "X.twikit_account5" in "Scrapers ready" and "Completed scrape" lines
-            acct_tag = f"twikit_account{acc_num}"
             # Count "Scrapers ready" mentions as scheduling activity
-            scheduled_count = len(re.findall(rf"X\.{acct_tag}", logs))
+            scheduled_count = mentions[acc_num]
             # Count 429 rate limits mentioning this account
-            scrape_429s = len(re.findall(rf"{acct_tag}.*429|Pagination.*429.*{acct_tag}", logs, re.IGNORECASE))
+            scrape_429s = rate_limits[acc_num]
             # Count auth errors (403/401)
-            scrape_errors = len(re.findall(rf"{acct_tag}.*(403|401|expired|suspended)", logs, re.IGNORECASE))
+            scrape_errors = auth_errors[acc_num]
 
             scheduled = scheduled_count > 0
 
@@ -310,7 +846,7 @@ else:
         active_count = sum(1 for r in results if r.get("status") in ("active", "scheduled"))
         error_count = sum(1 for r in results if r.get("status") in ("error", "missing"))
         result = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now_iso,
             "accounts": results,
             "active": active_count,
             "idle_or_rate_limited": sum(1 for r in results if r.get("status") in ("idle", "rate_limited")),
@@ -321,39 +857,29 @@ else:
             ),
             "note": "Status based on cookie files + actual scraping logs (not cold API calls)"
         }
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=dump_json(result))]
 
     elif name == "get_data_stats":
         # Query SQLite for record counts
         db_path = DATA_UNIVERSE_PATH / "SqliteMinerStorage.sqlite"
-        if not db_path.exists():
-            return [TextContent(type="text", text=json.dumps({"error": "Database not found"}))]
+        try:
+            db_size = db_path.stat().st_size
+        except FileNotFoundError:
+            return [TextContent(type="text", text=dump_json({"error": "Database not found"}))]
 
-        script = f"""
-import sqlite3
-import json
-conn = sqlite3.connect('{db_path}')
-c = conn.cursor()
-reddit = c.execute("SELECT COUNT(*) FROM DataEntity WHERE source=1").fetchone()[0]
-x = c.execute("SELECT COUNT(*) FROM DataEntity WHERE source=2").fetchone()[0]
-total = c.execute("SELECT COUNT(*) FROM DataEntity").fetchone()[0]
-# Get DB size
-import os
-size_mb = round(os.path.getsize('{db_path}') / 1024 / 1024, 1)
-print(json.dumps({{'reddit': reddit, 'x': x, 'total': total, 'size_mb': size_mb}}))
-"""
         try:
-            result = subprocess.run(
-                [str(DATA_UNIVERSE_PATH / "venv" / "bin" / "python"), "-c", script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            stats = json.loads(result.stdout.strip())
+            async with _DB_LOCK:
+                counts = await asyncio.to_thread(count_data_entities, db_path)
+            stats = {
+                "reddit": counts.get(1, 0),
+                "x": counts.get(2, 0),
+                "total": sum(counts.values()),
+                "size_mb": round(db_size / 1024 / 1024, 1)
+            }
             stats["timestamp"] = datetime.utcnow().isoformat()
-            return [TextContent(type="text", text=json.dumps(stats, indent=2))]
+            return [TextContent(type="text", text=dump_json(stats))]
         except Exception as e:
-            return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
+            return [TextContent(type="text", text=dump_json({"error": str(e)}))]
 
     elif name == "get_validator_report":
         # Run validator_monitor.py to analyze logs
@@ -371,23 +897,23 @@ print(json.dumps({{'reddit': reddit, 'x': x, 'total': total, 'size_mb': size_mb}
             cmd.extend(["--hours", str(hours)])
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+            result = await run_command(cmd, timeout=120)
             if result.returncode == 0:
                 stats = json.loads(result.stdout.strip())
                 stats["timestamp"] = datetime.utcnow().isoformat()
-                return [TextContent(type="text", text=json.dumps(stats, indent=2))]
+                return [TextContent(type="text", text=dump_json(stats))]
             else:
-                return [TextContent(type="text", text=json.dumps({
+                return [TextContent(type="text", text=dump_json({
                     "error": result.stderr or "validator_monitor.py failed",
                     "note": "Try providing --file path to exported validator logs JSON"
                 }))]
         except json.JSONDecodeError:
-            return [TextContent(type="text", text=json.dumps({
+            return [TextContent(type="text", text=dump_json({
                 "error": "Could not parse validator monitor output",
                 "raw": result.stdout[:500] if result.stdout else None
             }))]
         except Exception as e:
-            return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
+            return [TextContent(type="text", text=dump_json({"error": str(e)}))]
 
     return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
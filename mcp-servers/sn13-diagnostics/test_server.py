@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+SN13 Diagnostics Server Tests
+=============================
+
+Tests that the compiled error catalog scan finds the same entries as
+searching each catalog pattern on its own.
+Run with: python test_server.py
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# The server reads its paths from the environment at import time
+_DATA_DIR = tempfile.mkdtemp()
+os.environ["DATA_UNIVERSE_PATH"] = _DATA_DIR
+(Path(_DATA_DIR) / "scripts").mkdir()
+
+import server  # noqa: E402
+
+CATALOG = [
+    {"id": "PLAIN", "pattern": "rate limit"},
+    # SHADOWED matches at the same spot as SHADOWING, which comes first
+    {"id": "SHADOWING", "pattern": "connection"},
+    {"id": "SHADOWED", "pattern": "connection timeout"},
+    {"id": "FLAGS", "pattern": "(?i)timeout"},
+    {"id": "BACKREF", "pattern": r"(\w+) \1"},
+    {"id": "BACKREF_SHIFTED", "pattern": r"(a)(b)\2"},
+    {"id": "BACKREF_NAMED", "pattern": r"(?P<word>x+)-(?P=word)"},
+    {"id": "SHARED_NAME_1", "pattern": r"(?P<code>40[13])"},
+    {"id": "SHARED_NAME_2", "pattern": r"HTTP (?P<code>5\d\d)"},
+    {"id": "NEVER", "pattern": "never-here"},
+    {"id": "INVALID", "pattern": "(unclosed"},
+]
+
+LOGS = [
+    b"all quiet\n",
+    b"xx abb yy\n",
+    b"hello hello\n",
+    b"xx-xx\n",
+    b"connection timeout\n",
+    b"Rate Limit hit, got 403 then HTTP 502\n",
+    b"connection refused; TimeOut; aa bb\n",
+]
+
+
+def write_catalog(errors: list):
+    """Write errors as the catalog the server will load."""
+    with open(server.ERROR_CATALOG_PATH, "w") as f:
+        json.dump({"version": "test", "errors": errors}, f)
+
+
+def baseline(errors: list, logs: bytes) -> list:
+    """Get the IDs of entries whose pattern matches logs on its own."""
+    found = []
+    for err in errors:
+        try:
+            if re.search(err["pattern"].encode(), logs, re.IGNORECASE):
+                found.append(err["id"])
+        except re.error:
+            pass
+    return sorted(found)
+
+
+def scanned(logs: bytes) -> list:
+    """Get the IDs of entries scan_catalog reports for logs."""
+    compiled = server.get_compiled_catalog()
+    names = server.scan_catalog(compiled, logs)
+    return sorted(compiled["entries"][name]["id"] for name in names)
+
+
+def check_scan(errors: list, label: str):
+    """Compare scan_catalog against the per-pattern baseline for all LOGS."""
+    print(f"\nTesting scan_catalog ({label}):\n")
+    passed = 0
+    failed = 0
+
+    write_catalog(errors)
+    server._CATALOG_CACHE = {}
+
+    for logs in LOGS:
+        expected = baseline(errors, logs)
+        result = scanned(logs)
+        if result == expected:
+            print(f"  PASS: {logs!r} -> {result}")
+            passed += 1
+        else:
+            print(f"  FAIL: {logs!r}")
+            print(f"         Expected: {expected}, Got: {result}")
+            failed += 1
+
+    return passed, failed
+
+
+def main():
+    print("=" * 70)
+    print("  SN13 DIAGNOSTICS SCAN TESTS")
+    print("=" * 70)
+    print(f"  re2: {'yes' if server.re2 is not None else 'no'}, "
+          f"pyahocorasick: {'yes' if server.ahocorasick is not None else 'no'}")
+
+    passed = 0
+    failed = 0
+
+    # Full catalog, including a shared group name that breaks the alternation
+    p, f = check_scan(CATALOG, "full catalog")
+    passed += p
+    failed += f
+
+    # Without the shared name, so the alternation itself is exercised
+    p, f = check_scan(
+        [err for err in CATALOG if err["id"] != "SHARED_NAME_2"],
+        "alternation"
+    )
+    passed += p
+    failed += f
+
+    # Summary
+    print("\n" + "-" * 70)
+    print(f"  Results: {passed} passed, {failed} failed")
+    print("-" * 70)
+
+    if failed == 0:
+        print("\n  ALL TESTS PASSED")
+        return 0
+    else:
+        print(f"\n  {failed} TEST(S) FAILED")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())